@@ -11,7 +11,6 @@ This code is licensed under the GNU GPLv3 License. For details, see the LICENSE
 
 
 import os  # Import the os module for file and path operations
-import copy  # Import the copy module for creating deep copies of objects
 import time as tm  # Import the time module as tm for time-related operations
 import numpy as np  # Import numpy for numerical operations
 import pandas as pd  # Import pandas for data manipulation and analysis
@@ -47,6 +46,9 @@ class GreenLightModel:
         controls_file (str): Control trajectories file (default is None).
         epw_path (str): EPW file path (default is None).
         artificialWeather (bool): Whether to use artificial weather data (default is False).
+        precision (str): Storage precision of the auxiliary, control and weather results, 'f64' or 'f32' (default is 'f64').
+            The states and the integration always use float64. Other values raise a ValueError.
+        dtype (numpy.dtype): Data type of the stored results, resolved from precision.
         controls (numpy.ndarray): Control strategies data (default is None).
         u (numpy.ndarray): 'u' parameter matrix for the ODE solver (default is None).
         weather (numpy.ndarray): Weather data.
@@ -65,6 +67,7 @@ class GreenLightModel:
         controls_file=None,     # Control trajectories file
         epw_path=None,          # Weather EPW file path
         csv_path=None,          # Weather CSV file path
+        precision="f64",        # Storage precision of the results, "f64" or "f32"
     ):
         # Initialize the filename attribute
         self.filename = filename
@@ -86,6 +89,13 @@ class GreenLightModel:
         self.u = None
         # Set the path to the CSV file
         self.csv_path = csv_path
+        # Cache of loaded season weather data, keyed by the settings the loaded season depends on
+        self._weather_cache = {}
+        # Set the storage precision of the results and the matching data type
+        if precision not in ("f64", "f32"):
+            raise ValueError(f"Unsupported precision {precision!r}, expected 'f64' or 'f32'")
+        self.precision = precision
+        self.dtype = np.float32 if precision == "f32" else np.float64
 
   
     def _get_weather_data_path(self):
@@ -105,26 +115,21 @@ class GreenLightModel:
                 return check_csv(csv_path=self.csv_path, timestep=5)
           
 
-    def _load_weather_data(self, path, season_length, start_row, end_row):
+    def _load_weather_data(self, path, season_length):
         """
-        Loads weather data from the specified path, slicing it based on start and end rows.
+        Loads the weather data of the whole season from the specified path.
 
         Args:
             path (str): The path to the weather data file.
             season_length (int): The length of the simulation season.
-            start_row (int): The starting index row for slicing.
-            end_row (int): The ending index row for slicing.
 
         Returns:
-            np.ndarray: The sliced weather data.
+            np.ndarray: The weather data of the season.
         """
-        # Normalize lamp type to lowercase, set to 'none' if not 'hps' or 'led'
-        self.lampType = self.lampType.lower() if self.lampType.lower() in ["hps", "led"] else "none"
-
         # Check if artificial weather data should be used
         if self.artificialWeather:
-            # Generate artificial weather data and slice it
-            return make_artificial_input(5)[start_row:end_row]
+            # Generate artificial weather data
+            return make_artificial_input(5)
 
         # Get the file extension of the weather data path
         ext = os.path.splitext(path)[1]
@@ -137,8 +142,7 @@ class GreenLightModel:
             # Raise an error if the file format is not supported
             raise ValueError("Unsupported weather data file format")
 
-        # Slice and return the weather data
-        return weather_data[start_row:end_row]
+        return weather_data
 
     def _set_elevation(self):
         """
@@ -215,9 +219,16 @@ class GreenLightModel:
             start_row (int): The starting index row for the weather data slicing.
             end_row (int): The ending index row for the weather data slicing.
         """
-        # Prepare weather data
-        weather_data_path = self._get_weather_data_path()
-        self.weather = self._load_weather_data(weather_data_path, season_length, start_row, end_row)
+        # Normalize lamp type to lowercase, set to 'none' if not 'hps' or 'led'
+        self.lampType = self.lampType.lower() if self.lampType.lower() in ["hps", "led"] else "none"
+
+        # Prepare weather data, the season is only loaded once and reused by later runs with the same settings
+        weather_key = (self.first_day, season_length, self.csv_path, self.epw_path, self.artificialWeather)
+        if weather_key not in self._weather_cache:
+            weather_data_path = self._get_weather_data_path()
+            self._weather_cache[weather_key] = self._load_weather_data(weather_data_path, season_length)
+        # The model creation copies the weather data, so the cached season can be sliced without a copy
+        self.weather = self._weather_cache[weather_key][start_row:end_row]
         
         # Process elevation
         self._set_elevation()
@@ -319,7 +330,7 @@ class GreenLightModel:
         )
 
         # Change the time resolution of the results, set the time step, and generate the model results
-        self.gl = change_res(self.gl, self.d, sol, time_step)
+        self.gl = change_res(self.gl, self.d, sol, time_step, self.dtype)
         
         # Return the simulation results
         return self.gl
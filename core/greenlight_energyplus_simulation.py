@@ -8,13 +8,30 @@ Author's email: qiu.daidai@outlook.com
 This code is licensed under the GNU GPLv3 License. For details, see the LICENSE file.
 """
 
+import logging
+
 from ..service_functions.funcs import calculate_energy_consumption, extract_last_value_from_nested_dict
 from .green_light_model import GreenLightModel
 
+logger = logging.getLogger(__name__)
+
+ATMOSPHERIC_PRESSURE = 101325  # 标准大气压力, 单位为帕斯卡(Pa)
+MINUTES_IN_DAY = 1440  # 一天的分钟数
+DRY_MATTER_CONTENT = 0.06  # 果实干物质含量, 用于将干重换算为鲜重
+
+# 传感器句柄: (属性名, 变量名, 变量键, 描述, 是否必需)
+SENSOR_HANDLES = (
+    ("temp_sensor_handle", "Zone Air Temperature", "GREENHOUSE ZONE ROOF", "室内温度", True),
+    ("rh_sensor_handle", "Zone Air Relative Humidity", "GREENHOUSE ZONE ROOF", "室内相对湿度", True),
+    ("outdoor_air_temp_handle", "Site Outdoor Air Drybulb Temperature", "Environment", "室外空气温度", False),
+    ("humidity_ratio_handle", "Zone Air Humidity Ratio", "GREENHOUSE ZONE ROOF", "室内空气湿度比", False),
+)
+
 
 class GreenhouseSimulation:
 
-    def __init__(self, api, epw_path, idf_path, csv_path, output_directory, first_day, season_length, isMature=False):
+    def __init__(self, api, epw_path, idf_path, csv_path, output_directory, first_day, season_length, isMature=False,
+                 min_run_interval=5):
         super().__init__()
         self.api = api
         self.epw_path = epw_path
@@ -26,6 +43,12 @@ class GreenhouseSimulation:
         self.simulation_started = False
         self.isMature = isMature
 
+        # 启动时的错误信息(例如找不到必需的传感器句柄), 回调函数中的异常会被EnergyPlus吞掉, 所以在run()结束后抛出
+        self.startup_error = None
+
+        # 两次运行GreenLight模型之间的最小时间间隔, 分钟(默认与天气数据的5分钟分辨率一致)
+        self.min_run_interval = min_run_interval
+
         # 初始化各种传感器句柄为None
         self.temp_sensor_handle = None
         self.rh_sensor_handle = None
@@ -93,35 +116,27 @@ class GreenhouseSimulation:
 
     def on_begin_new_environment(self, state):
         """在模拟开始新环境（年份/周期）时调用此方法"""
-        # 获取室内温度传感器句柄
-        self.temp_sensor_handle = self.api.exchange.get_variable_handle(
-            state, "Zone Air Temperature", "GREENHOUSE ZONE ROOF"
-        )
-        if self.temp_sensor_handle == -1:
-            print("无法找到室内温度传感器句柄。")
-            sys.exit(1)
-
-        # 获取室内相对湿度传感器句柄
-        self.rh_sensor_handle = self.api.exchange.get_variable_handle(
-            state, "Zone Air Relative Humidity", "GREENHOUSE ZONE ROOF"
-        )
-        if self.rh_sensor_handle == -1:
-            print("无法找到室内相对湿度传感器句柄。")
-            sys.exit(1)
-
-        # 获取室外空气温度传感器句柄
-        self.outdoor_air_temp_handle = self.api.exchange.get_variable_handle(
-            state, "Site Outdoor Air Drybulb Temperature", "Environment"
-        )
-        if self.outdoor_air_temp_handle == -1:
-            print("无法找到室外空气温度传感器句柄。")
-
-        # 获取室内空气湿度比传感器句柄
-        self.humidity_ratio_handle = self.api.exchange.get_variable_handle(
-            state, "Zone Air Humidity Ratio", "GREENHOUSE ZONE ROOF"
-        )
-        if self.humidity_ratio_handle == -1:
-            print("无法找到室内空气湿度比传感器句柄。")
+        exchange = self.api.exchange
+
+        # 获取所有传感器句柄, 记录找不到的必需句柄
+        missing = []
+        for attr_name, variable_name, variable_key, description, required in SENSOR_HANDLES:
+            handle = exchange.get_variable_handle(state, variable_name, variable_key)
+            setattr(self, attr_name, handle)
+            if handle == -1:
+                if required:
+                    missing.append(f"{description}: {variable_name} / {variable_key}")
+                else:
+                    print(f"无法找到{description}传感器句柄。")
+
+        # 缓存读取传感器数值的方法, 避免在每个时间步重复查找属性
+        self._get_variable_value = exchange.get_variable_value
+
+        # 必需的句柄找不到时报告严重错误并停止EnergyPlus模拟
+        if missing:
+            self.startup_error = "无法找到必需的传感器句柄: " + "; ".join(missing)
+            self.api.runtime.issue_severe(state, self.startup_error)
+            self.api.runtime.stop_simulation(state)
 
     def on_after_new_environment_warmup_complete(self, state):
         """在预热完成后调用此方法"""
@@ -131,20 +146,22 @@ class GreenhouseSimulation:
 
     def on_end_of_zone_timestep_after_zone_reporting(self, state):
         """在每个区域时间步结束后调用此方法"""
+        # 启动失败时模拟已被停止, 不再运行模型
+        if self.startup_error is not None:
+            return
+
+        get_variable_value = self._get_variable_value
+
         # 读取当前室内温度
-        current_temperature = self.api.exchange.get_variable_value(
-            state, self.temp_sensor_handle)
+        current_temperature = get_variable_value(state, self.temp_sensor_handle)
 
         # 读取当前室外温度
-        current_outdoor_temperature = self.api.exchange.get_variable_value(
-            state, self.outdoor_air_temp_handle)
+        current_outdoor_temperature = get_variable_value(state, self.outdoor_air_temp_handle)
 
         # 读取当前室内空气湿度比
-        current_humidity_ratio = self.api.exchange.get_variable_value(
-            state, self.humidity_ratio_handle)
+        current_humidity_ratio = get_variable_value(state, self.humidity_ratio_handle)
 
         # 计算当前室内饱和水蒸气压力
-        ATMOSPHERIC_PRESSURE = 101325  # 标准大气压力, 单位为帕斯卡(Pa)
         vpTop = (current_humidity_ratio / (0.621945 +
                  current_humidity_ratio)) * ATMOSPHERIC_PRESSURE
 
@@ -159,51 +176,68 @@ class GreenhouseSimulation:
                 # 计算当前时间步的分钟数
                 current_minutes = current_time_float * 60
 
-                # 如果当前时间步的分钟数小于上一时间步的分钟数,说明跨天了
-                if current_minutes < self.last_time_step * 60:
-                    current_minutes += 1440  # 加上一天的分钟数
+                # 更新总分钟数, 取模处理跨天的情况(当前分钟数小于上一时间步的分钟数)
+                self.total_minutes += (current_minutes - self.last_time_step * 60) % MINUTES_IN_DAY
 
-                # 更新总分钟数
-                self.total_minutes += current_minutes - self.last_time_step * 60
-
-                # 计算起始时间和结束时间
-                self.start_time = self.end_time
+                # 计算结束时间, 起始时间为上一次运行模型的结束时间
                 self.end_time = self.total_minutes
 
             # 更新last_time_step变量
             self.last_time_step = current_time_float
 
-            # 运行模型, 根据EnergyPlus输出的时间更新需要调用的数据开始和结束时间
-            gl = self.model.run_model(gl_params=self.init_state, season_length=self.season_length, season_interval=self.season_interval,
-                                      start_row=int(self.start_time), end_row=int(self.end_time),
-                                      step=self.current_step)
-
-            print(f"start_time: {self.start_time}, end_time: {self.end_time}, step: {self.current_step} season_length: {self.season_length}, season_interval: {self.season_interval}")
+            # 累积的时间间隔小于最小运行间隔时跳过本次运行, 由下一次运行一并积分
+            if self.end_time - self.start_time < self.min_run_interval:
+                return
 
-            self.init_state = gl
+            # 运行模型并累积产量和能耗
+            self._run_window()
 
             # 使用EnergyPlus输出的数据更新GreenLight模型的状态, 从而实现数据传递
-            # print(f"原始温度: {self.init_state['x']['tTop'][-1][-1]}, 原始饱和水蒸气压力: {self.init_state['x']['vpTop'][-1][-1]}")
+            # print(f"原始温度: {self.init_state['x']['tTop']}, 原始饱和水蒸气压力: {self.init_state['x']['vpTop']}")
 
-            self.init_state['x']["tTop"][-1][-1] = current_temperature
-            self.init_state['x']["vpTop"][-1][-1] = vpTop
+            self.init_state['x']["tTop"] = current_temperature
+            self.init_state['x']["vpTop"] = vpTop
 
             # print(f"温度被替换为: {current_temperature}, 饱和水蒸气压力被替换为: {vpTop}")
 
-            self.current_step += 1
+    def _run_window(self):
+        """在start_time到end_time的时间窗口上运行GreenLight模型, 并累积产量和能耗"""
+        # 运行模型, 根据EnergyPlus输出的时间更新需要调用的数据开始和结束时间
+        gl = self.model.run_model(gl_params=self.init_state, season_length=self.season_length, season_interval=self.season_interval,
+                                  start_row=int(self.start_time), end_row=int(self.end_time),
+                                  step=self.current_step)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("start_time: %s, end_time: %s, step: %s season_length: %s, season_interval: %s",
+                         self.start_time, self.end_time, self.current_step, self.season_length, self.season_interval)
 
-            # 计算水果产量
-            dmc = 0.06
-            self.total_yield += 1e-6 * \
-                calculate_energy_consumption(gl, "mcFruitHar") / dmc
+        # 只保留下一步需要的最后时刻的状态, 下一步从该状态开始积分
+        self.init_state = extract_last_value_from_nested_dict(gl)
 
-            # 计算照明和加热产生的能耗
-            self.lampIn += 1e-6 * \
-                calculate_energy_consumption(gl, "qLampIn", "qIntLampIn")
-            self.boilIn += 1e-6 * \
-                calculate_energy_consumption(gl, "hBoilPipe", "hBoilGroPipe")
+        self.current_step += 1
 
-            # print(f"total_yield: {self.total_yield}, lampIn: {self.lampIn}, boilIn: {self.boilIn}")
+        # 下一次运行从本次运行的结束时间开始
+        self.start_time = self.end_time
+
+        # 计算水果产量, 只积分本次运行的时间窗口
+        self.total_yield += 1e-6 * \
+            calculate_energy_consumption(gl, "mcFruitHar") / DRY_MATTER_CONTENT
+
+        # 计算照明和加热产生的能耗
+        self.lampIn += 1e-6 * \
+            calculate_energy_consumption(gl, "qLampIn", "qIntLampIn")
+        self.boilIn += 1e-6 * \
+            calculate_energy_consumption(gl, "hBoilPipe", "hBoilGroPipe")
+
+        # print(f"total_yield: {self.total_yield}, lampIn: {self.lampIn}, boilIn: {self.boilIn}")
+
+    def _flush_pending_window(self):
+        """模拟结束时运行尚未积分的时间窗口(短于最小运行间隔的剩余部分)"""
+        if self.last_time_step is None:
+            return
+        # 模型按整行读取天气数据, 窗口至少包含一行时才运行
+        if int(self.end_time) > int(self.start_time):
+            self._run_window()
 
     def run(self):
 
@@ -228,5 +262,14 @@ class GreenhouseSimulation:
             ]
         )
 
+        # 启动失败时抛出异常, 回调函数中抛出的异常不会传递到这里
+        if self.startup_error is not None:
+            raise RuntimeError(self.startup_error)
+
+        # 积分模拟结束时剩余的时间窗口
+        self._flush_pending_window()
+
     def get_results(self):
+        # 返回结果前确保剩余的时间窗口已被积分
+        self._flush_pending_window()
         return self.total_yield, self.lampIn, self.boilIn
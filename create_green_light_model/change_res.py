@@ -17,21 +17,57 @@ This code is licensed under the GNU GPLv3 License. For details, see the LICENSE
 """
 
 import numpy as np
-from .set_gl_aux import set_gl_aux
+from .set_gl_aux import set_gl_aux, set_gl_aux_control_rules
 from .set_gl_control import set_gl_control
 
+def _interp_weights(time, new_time):
+    """
+    Locate new time points on the original time points for linear interpolation.
+    Points outside the original time range take the first or last value, as in np.interp.
+
+    Args:
+        time (np.ndarray): Original, increasing time points.
+        new_time (np.ndarray): Time points to interpolate to.
+
+    Returns:
+        tuple: Indices of the lower neighbours and the weights of the upper neighbours.
+    """
+    idx = np.searchsorted(time, new_time, side="right") - 1
+    np.clip(idx, 0, len(time) - 2, out=idx)
+    weight = (new_time - time[idx]) / (time[idx + 1] - time[idx])
+    np.clip(weight, 0, 1, out=weight)
+    return idx, weight
+
+
+def _interp_rows(values, idx, weight, out):
+    """
+    Linearly blend the rows of values between the lower neighbours idx and idx + 1.
+
+    Args:
+        values (np.ndarray): Values at the original time points, one row per time point.
+        idx (np.ndarray): Indices of the lower neighbours.
+        weight (np.ndarray): Weights of the upper neighbours.
+        out (np.ndarray): Array the interpolated rows are written to.
+    """
+    lower = values[idx]
+    np.subtract(values[idx + 1], lower, out=out)
+    out *= weight[:, np.newaxis].astype(out.dtype, copy=False)
+    out += lower
+
+
 class GreenLightChangeRes:
     def __init__(self, gl):
         self.gl = gl
 
 
-    def _process_data(self, x_matrix, d_matrix):
+    def _process_data(self, x_matrix, d_matrix, dtype=np.float64):
         """
         Process data using a given gl dictionary.
 
         Args:
             x_matrix (np.ndarray): Matrix containing the values of the independent variables.
             d_matrix (np.ndarray): Matrix containing the values of the dependent variables.
+            dtype (np.dtype): Data type of the returned matrices.
 
         Returns:
             tuple: Two matrices containing the values of the u and a variables.
@@ -44,61 +80,86 @@ class GreenLightChangeRes:
         a_len = len(self.gl["a"].keys())
         u_len = len(self.gl["u"].keys())
 
-        # Initialize temporary lists for a and u variables
-        temp_list_a = np.empty((num_rows, a_len + 1))
-        temp_list_u = np.empty((num_rows, u_len + 1))
+        # Initialize temporary lists for a and u variables, the time column is shared with x
+        temp_list_a = np.empty((num_rows, a_len + 1), dtype=dtype)
+        temp_list_u = np.empty((num_rows, u_len + 1), dtype=dtype)
+        temp_list_a[:, 0] = x_matrix[:, 0]
+        temp_list_u[:, 0] = x_matrix[:, 0]
+
+        # Values without the time column
+        x_values = x_matrix[:, 1:]
+        d_values = d_matrix[:, 1:]
+
+        # The x and d dictionaries are reused and updated in place for every row
+        gl_x = self.gl["x"]
+        gl_d = self.gl["d"]
+
+        # Live views of the a and u values, they follow the in-place updates of the aux and control functions
+        a_values = self.gl["a"].values()
+        u_values = self.gl["u"].values()
+
+        # Local bindings for the names used in the loop
+        gl = self.gl
+        set_aux_control_rules = set_gl_aux_control_rules
+        set_control = set_gl_control
+        set_aux = set_gl_aux
+        fromiter = np.fromiter
 
         # Process each row of x and d matrices
-        for count, (x_row, d_row) in enumerate(zip(x_matrix, d_matrix)):
+        for count in range(num_rows):
             # Update gl dictionary with current x and d values
-            self.gl["x"] = dict(zip(x_keys, x_row[1:]))
-            self.gl["d"] = dict(zip(d_keys, d_row[1:]))
+            gl_x.update(zip(x_keys, x_values[count]))
+            gl_d.update(zip(d_keys, d_values[count]))
 
-            # Set the auxiliary variables
-            set_gl_aux(self.gl)
+            # Set the auxiliary variables needed by the controls
+            set_aux_control_rules(gl)
             # Set the control variables
-            set_gl_control(self.gl)
-            # Set the auxiliary variables again
-            set_gl_aux(self.gl)
+            set_control(gl)
+            # Set all auxiliary variables with the new controls
+            set_aux(gl)
 
             # Store calculated a and u values
-            temp_list_a[count] = np.hstack(([x_row[0]], list(self.gl["a"].values())))
-            temp_list_u[count] = np.hstack(([x_row[0]], list(self.gl["u"].values())))
+            temp_list_a[count, 1:] = fromiter(a_values, dtype, count=a_len)
+            temp_list_u[count, 1:] = fromiter(u_values, dtype, count=u_len)
 
         return temp_list_u, temp_list_a
 
-    def _interpolate_time(self, data_matrix, time_step):
+    def _interpolate_time(self, time, time_step, *data_matrices):
         """
-        Interpolate data to a new time step.
+        Interpolate data matrices sharing the same time points to a new time step.
 
         Args:
-            data_matrix (np.ndarray): Data matrix with time in the first column and y data in the remaining columns.
+            time (np.ndarray): Time points shared by all data matrices, in seconds.
             time_step (float): New time step to interpolate data to.
+            *data_matrices (np.ndarray): Data matrices with time in the first column and y data in the remaining columns.
 
         Returns:
-            np.ndarray: Data matrix with interpolated y data at the new time step.
+            list: Data matrices with interpolated y data at the new time step, each with the data type of its input.
         """
-        # Extract time column
-        time = data_matrix[:, 0]  # Assume time is in seconds
         # Create new time array with desired time step
         new_time = np.arange(time[0], time[-1], time_step)
-        # Extract y data
-        y_data = data_matrix[:, 1:]
-        # Interpolate y data for each column
-        new_y_data = np.column_stack(
-            [np.interp(new_time, time, y_data[:, i])
-             for i in range(y_data.shape[1])]
-        )
-        # Combine new time and interpolated y data
-        return np.column_stack((new_time[:, np.newaxis], new_y_data))
 
-    def _reorganize_dict(self, key, new_data):
+        # Locate the new time points on the original time points once for all matrices
+        idx, weight = _interp_weights(time, new_time)
+
+        new_matrices = []
+        for data_matrix in data_matrices:
+            # Linear blend between the neighbouring rows, written into the output matrix
+            new_data = np.empty((len(new_time), data_matrix.shape[1]), dtype=data_matrix.dtype)
+            new_data[:, 0] = new_time
+            _interp_rows(data_matrix[:, 1:], idx, weight, new_data[:, 1:])
+            new_matrices.append(new_data)
+
+        return new_matrices
+
+    def _reorganize_dict(self, key, new_data, dtype=np.float64):
         """
         Reorganize a dictionary with new data.
 
         Args:
             key (str): Key to reorganize within the dictionary.
             new_data (np.ndarray): New data to add to the dictionary.
+            dtype (np.dtype): Data type of the stored data.
 
         Returns:
             dict: The updated dictionary.
@@ -106,21 +167,20 @@ class GreenLightChangeRes:
         # Retrieve the dictionary at the specified key
         my_dict = self.gl[key]
 
-        # Create a new column stack for each key in the dictionary
-        col_stack = [
-            np.column_stack(
-                (new_data[:, 0], new_data[:, idx + 1])
-            ) if new_data.shape[1] > idx + 1 else np.column_stack(
-                (new_data[:, 0], np.zeros(new_data.shape[0]))
-            )
-            for idx in range(len(my_dict))
-        ]
+        # Number of keys that have a data column, any remaining keys are filled with zeros
+        num_keys = len(my_dict)
+        num_cols = min(num_keys, new_data.shape[1] - 1)
+
+        # Build all [time, value] matrices in one buffer of shape (keys, rows, 2)
+        col_stack = np.zeros((num_keys, new_data.shape[0], 2), dtype=dtype)
+        col_stack[:, :, 0] = new_data[:, 0]
+        col_stack[:num_cols, :, 1] = new_data[:, 1:num_cols + 1].T
 
         # Update the dictionary with the new column stacks
         self.gl[key] = dict(zip(my_dict.keys(), col_stack))
         return self.gl
 
-    def change_res(self, d, sol, time_step=300):
+    def change_res(self, d, sol, time_step=300, dtype=np.float64):
         """
         Changes the resolution of the GreenLight model solution by interpolating the solution at a different time step.
 
@@ -128,37 +188,43 @@ class GreenLightChangeRes:
             d (np.ndarray): An array of the environmental inputs to the model.
             sol (scipy.integrate.ode solution): The solution of the GreenLight model.
             time_step (float): The time step at which to interpolate the solution.
+            dtype (np.dtype): Data type of the stored u, a and d results. The states x are always stored as float64,
+                since they are used as initial values of a following run.
 
         Returns:
             dict: A dictionary containing the GreenLight model variables interpolated at the new time step.
         """
-        # Interpolate d matrix to match solution time points
-        d_matrix = np.column_stack(
-            (sol.t, *[np.interp(sol.t, d[:, 0], d[:, i])
-             for i in range(1, d.shape[1])])
-        )
-        # Combine solution time and state variables
-        x_matrix = np.column_stack((sol.t, sol.y.T))
+        # Interpolate d matrix to match solution time points, all columns in one pass
+        d_matrix = np.empty((len(sol.t), d.shape[1]))
+        d_matrix[:, 0] = sol.t
+        idx, weight = _interp_weights(d[:, 0], sol.t)
+        _interp_rows(d[:, 1:], idx, weight, d_matrix[:, 1:])
+        # Combine solution time and state variables in one preallocated matrix
+        x_matrix = np.empty((len(sol.t), sol.y.shape[0] + 1))
+        x_matrix[:, 0] = sol.t
+        x_matrix[:, 1:] = sol.y.T
 
         # Calculate u and a based on x and d
-        u_matrix, a_matrix = self._process_data(x_matrix, d_matrix)
+        u_matrix, a_matrix = self._process_data(x_matrix, d_matrix, dtype)
+
+        # d is only stored from here on, so it is interpolated in the storage data type like u and a
+        d_matrix = d_matrix.astype(dtype, copy=False)
 
-        # Interpolate all matrices to the new time step
-        d_matrix = self._interpolate_time(d_matrix, time_step)
-        x_matrix = self._interpolate_time(x_matrix, time_step)
-        u_matrix = self._interpolate_time(u_matrix, time_step)
-        a_matrix = self._interpolate_time(a_matrix, time_step)
+        # Interpolate all matrices to the new time step, they share the solution time points
+        d_matrix, x_matrix, u_matrix, a_matrix = self._interpolate_time(
+            sol.t, time_step, d_matrix, x_matrix, u_matrix, a_matrix
+        )
 
         # Reorganize the gl dictionary with the new interpolated data
-        self.gl = self._reorganize_dict("u", u_matrix)
-        self.gl = self._reorganize_dict("a", a_matrix)
-        self.gl = self._reorganize_dict("d", d_matrix)
+        self.gl = self._reorganize_dict("u", u_matrix, dtype)
+        self.gl = self._reorganize_dict("a", a_matrix, dtype)
+        self.gl = self._reorganize_dict("d", d_matrix, dtype)
         self.gl = self._reorganize_dict("x", x_matrix)
 
         return self.gl
     
 
-def change_res(gl, d, sol, time_step=300):
+def change_res(gl, d, sol, time_step=300, dtype=np.float64):
     """
     Changes the resolution of the GreenLight model solution by interpolating the solution at a different time step.
 
@@ -167,6 +233,7 @@ def change_res(gl, d, sol, time_step=300):
         d (np.ndarray): An array of the environmental inputs to the model.
         sol (scipy.integrate.ode solution): The solution of the GreenLight model.
         time_step (float): The time step at which to interpolate the solution.
+        dtype (np.dtype): Data type of the stored u, a and d results.
 
     Returns:
         dict: A dictionary containing the GreenLight model variables interpolated at the new time step.
@@ -174,4 +241,4 @@ def change_res(gl, d, sol, time_step=300):
     # Create GreenLightChangeRes instance
     gl_change_res = GreenLightChangeRes(gl)
     # Change resolution of GreenLight model
-    return gl_change_res.change_res(d, sol, time_step)
\ No newline at end of file
+    return gl_change_res.change_res(d, sol, time_step, dtype)
\ No newline at end of file
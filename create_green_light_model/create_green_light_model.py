@@ -48,13 +48,18 @@ def create_green_light_model(lampType, weather, controls=None, indoor=None):
         - The weather data is expected to have the format [datenum, Tout, Hin, Uout, Rad, Rin].
         - The control trajectories are added to the GreenLight model instance if provided.
         - The lampType must be 'hps', 'led', or ''.
+        - The weather data is copied, the time column of the given array is not modified.
     """
 
+    # Work on a float64 copy, the weather data of the caller is left unchanged
+    weather = np.array(weather, dtype=np.float64)
+
     # Extract the first datenum value from the weather data
     weather_datenum = weather[0, 0]
 
     # Convert weather datenum to seconds from start time
-    weather[:, 0] = (weather[:, 0] - weather[0, 0]) * 86400
+    weather[:, 0] -= weather_datenum
+    weather[:, 0] *= 86400
 
     # Initialize an empty dictionary for the GreenLight model instance
     gl = {"x": {}, "a": {}, "d": {}, "p": {}, "u": {}}
@@ -18,10 +18,9 @@ This code is licensed under the GNU GPLv3 License. For details, see the LICENSE
 
 # Import necessary modules and functions
 from ..service_functions.funcs import *
-from .set_gl_aux import set_gl_aux
+from .set_gl_aux import set_gl_aux, set_gl_aux_control_rules
 from .set_gl_control import set_gl_control
 from .set_gl_odes import set_gl_odes
-import copy
 import numpy as np
 np.seterr(invalid="ignore", over="ignore")  # Set numpy to ignore invalid and overflow warnings
 
@@ -35,7 +34,34 @@ class ODESolver:
         self.gl = gl  # Store the entire GreenLight model instance
         self.d = d  # Store the entire uncontrolled variables matrix
         self.u = u  # Store the control variable matrix
-        self.prev_gl = {}  # Initialize dict to store previous GreenLight model instance
+        # States of the previous call, used to replace inf values, starting from the initial states
+        self.prev_x = np.array(list(gl["x"].values()), dtype=np.float64)
+
+        # State names in the order of the state array
+        self.x_keys = tuple(gl["x"].keys())
+
+        # Positions in the state array of the variables that are checked for inf values
+        self.check_idx = np.array([self.x_keys.index(key) for key in ["tBlScr", "tThScr", "tIntLamp", "tCovIn", "time"]])
+
+        # Split time points and values once, so sampling does not slice the matrices on every call
+        self.d_times = np.ascontiguousarray(d[:, 0])
+        self.d_values = np.ascontiguousarray(d[:, 1:])
+        self.d_cursor = 0  # Index of the interval of the last d sample
+        self.d_last = (None, None)  # Time and result of the last d sample
+        self.d_out = np.empty(self.d_values.shape[1])  # Buffer the d samples are written to
+        if u is not None:
+            self.u_times = np.ascontiguousarray(u[:, 0])
+            self.u_values = np.ascontiguousarray(u[:, 1:])
+            self.u_cursor = 0  # Index of the interval of the last u sample
+            self.u_last = (None, None)  # Time and result of the last u sample
+            self.u_out = np.empty(self.u_values.shape[1])  # Buffer the u samples are written to
+
+        # Dictionaries holding the sampled d and u values, reused by every call
+        self.d_keys = tuple(gl["d"].keys())
+        self.d_dict = dict.fromkeys(self.d_keys)
+        if u is not None:
+            self.u_keys = tuple(gl["u"].keys())
+            self.u_dict = dict.fromkeys(self.u_keys)
 
     def convert_dict_to_array(self, data_dict):
         """
@@ -51,40 +77,66 @@ class ODESolver:
             if data_dict[key].shape[0] != num_rows:
                 raise ValueError("All arrays must have the same number of rows")
         
-        # Build the result array
-        result_array = data_dict[keys[0]]
-        for key in keys[1:]:
-            result_array = np.hstack((result_array, data_dict[key][:, 1:]))
+        # Build the result array in one allocation, the time column is taken from the first array
+        parts = [data_dict[keys[0]]] + [data_dict[key][:, 1:] for key in keys[1:]]
+        result_array = np.concatenate(parts, axis=1, dtype=np.float64)
         
         return result_array
 
+    def interpolate(self, t, times, values, cursor, out):
+        """
+        Linearly interpolate all value columns at time t, handling boundary cases
+        :param t: Sampling time
+        :param times: Increasing time points
+        :param values: Values at the time points, one row per time point
+        :param cursor: Index of the interval of the previous sample, checked before searching
+        :param out: Array the interpolated values are written to
+        :return: Interpolated values and the index of the interval of t
+        """
+        if t <= times[0]:
+            return values[0], cursor  # If t is less than or equal to the minimum time, return the first row of data
+        elif t >= times[-1]:
+            return values[-1], cursor  # If t is greater than or equal to the maximum time, return the last row of data
+
+        # The solver mostly advances t monotonically, so t is usually in the same or the next interval
+        if times[cursor] <= t < times[cursor + 1]:
+            i = cursor
+        elif cursor + 2 < len(times) and times[cursor + 1] <= t < times[cursor + 2]:
+            i = cursor + 1
+        else:
+            i = np.searchsorted(times, t, side="right") - 1
+
+        # Interpolate all columns together, without allocating a new array
+        w = (t - times[i]) / (times[i + 1] - times[i])
+        np.subtract(values[i + 1], values[i], out=out)
+        out *= w
+        out += values[i]
+        return out, i
+
     def sample_d(self, t):
         """
         Sample uncontrollable factor data at time t, handling boundary cases
         :param t: Sampling time
-        :return: Sampling result
+        :return: Sampling result, the array is reused by the next sample
         """
-        if t <= self.d[0, 0]:
-            return self.d[0, 1:]  # If t is less than or equal to the minimum time, return the first row of data
-        elif t >= self.d[-1, 0]:
-            return self.d[-1, 1:]  # If t is greater than or equal to the maximum time, return the last row of data
-        else:
-            # Perform linear interpolation for each column
-            return np.array([np.interp(t, self.d[:, 0], self.d[:, k]) for k in range(1, self.d.shape[1])])
+        # The Jacobian estimate of the solver evaluates many states at the same time point
+        if t == self.d_last[0]:
+            return self.d_last[1]
+        d_sample, self.d_cursor = self.interpolate(t, self.d_times, self.d_values, self.d_cursor, self.d_out)
+        self.d_last = (t, d_sample)
+        return d_sample
 
     def sample_u(self, t):
         """
         Sample predefined control variables at time t, handling boundary cases
         :param t: Sampling time
-        :return: Sampling result
+        :return: Sampling result, the array is reused by the next sample
         """
-        if t <= self.u[0, 0]:
-            return self.u[0, 1:]  # If t is less than or equal to the minimum time, return the first row of data
-        elif t >= self.u[-1, 0]:
-            return self.u[-1, 1:]  # If t is greater than or equal to the maximum time, return the last row of data
-        else:
-            # Perform linear interpolation for each column
-            return np.array([np.interp(t, self.u[:, 0], self.u[:, k]) for k in range(1, self.u.shape[1])])
+        if t == self.u_last[0]:
+            return self.u_last[1]
+        u_sample, self.u_cursor = self.interpolate(t, self.u_times, self.u_values, self.u_cursor, self.u_out)
+        self.u_last = (t, u_sample)
+        return u_sample
 
     def ode(self, t, x):
         """
@@ -93,30 +145,34 @@ class ODESolver:
         :param x: Array of current dependent variables
         :return: List of ODE values at the current time step
         """
+        # Check if specific variables are inf and replace with previous value
+        inf_indices = np.isinf(x[self.check_idx])
+        if inf_indices.any():
+            x = x.copy()
+            replace_idx = self.check_idx[inf_indices]
+            x[replace_idx] = self.prev_x[replace_idx]
+        np.copyto(self.prev_x, x)
+
         # Update x values in the gl dictionary
-        self.gl["x"].update(zip(self.gl["x"].keys(), x))
+        self.gl["x"].update(zip(self.x_keys, x))
 
         # Sample uncontrollable factors at time t
         d_sample = self.sample_d(t)
-        self.gl["d"] = {key: value for key, value in zip(list(self.gl["d"].keys()), d_sample)}
+        self.d_dict.update(zip(self.d_keys, d_sample))
+        self.gl["d"] = self.d_dict
 
         # If control variables are provided, sample them at time t
         if self.u is not None:
             u_sample = self.sample_u(t)
-            self.gl["u"] = {key: value for key, value in zip(list(self.gl["u"].keys()), u_sample)}
-
-        # Check if specific variables are inf and replace with previous value
-        keys_to_check = ["tBlScr", "tThScr", "tIntLamp", "tCovIn", "time"]
-        values_to_check = np.array([self.gl["x"][key] for key in keys_to_check])
-        inf_indices = np.isinf(values_to_check)
-        
-        if np.any(inf_indices):
-            for idx, key in enumerate(keys_to_check):
-                if inf_indices[idx]:
-                    self.gl["x"][key] = self.prev_gl["x"][key]
+            self.u_dict.update(zip(self.u_keys, u_sample))
+            self.gl["u"] = self.u_dict
 
-        # Initialize values of auxiliary variables
-        self.gl = set_gl_aux(self.gl)
+        # Initialize values of the auxiliary variables needed by the controls,
+        # the first call sets all of them so that gl["a"] keeps its key order
+        if self.gl["a"]:
+            self.gl = set_gl_aux_control_rules(self.gl)
+        else:
+            self.gl = set_gl_aux(self.gl)
 
         # Calculate values of rule-based control variables
         self.gl = set_gl_control(self.gl)
@@ -127,7 +183,4 @@ class ODESolver:
         # Calculate ODE values
         dx_list = set_gl_odes(self.gl)
 
-        # Update prev_gl
-        self.prev_gl["x"] = self.gl["x"].copy()
-
         return dx_list
\ No newline at end of file
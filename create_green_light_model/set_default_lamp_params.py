@@ -15,6 +15,56 @@ Author's email: qiu.daidai@outlook.com
 This code is licensed under the GNU GPLv3 License. For details, see the LICENSE file.
 """
 
+from types import MappingProxyType
+
+# Default parameters of HPS lamps
+_HPS_PARAMS = MappingProxyType({
+    "thetaLampMax": 200 / 1.8,          # Maximum intensity of lamps [W m^{-2}], Set to achieve a PPFD of 200 umol (PAR) m^{-2} s^{-1}
+    "heatCorrection": 0,                # Correction for temperature setpoint when lamps are on [°C]
+    "etaLampPar": 1.8 / 4.9,            # Fraction of lamp input converted to PAR [-], Set to give a PPE of 1.8 umol (PAR) J^{-1} [1, including comments online]
+    "etaLampNir": 0.22,                 # Fraction of lamp input converted to NIR [-] [2]
+    "tauLampPar": 0.98,                 # Transmissivity of lamp layer to PAR [-] [3]
+    "rhoLampPar": 0,                    # Reflectivity of lamp layer to PAR [-] [3, pg. 26]
+    "tauLampNir": 0.98,                 # Transmissivity of lamp layer to NIR [-] [3]
+    "rhoLampNir": 0,                    # Reflectivity of lamp layer to NIR [-]
+    "tauLampFir": 0.98,                 # Transmissivity of lamp layer to FIR [-]
+    "aLamp": 0.02,                      # Lamp area [m^{2}{lamp} m^{-2}{floor}] [3, pg. 35]
+    "epsLampTop": 0.1,                  # Emissivity of top side of lamp [-] [4]
+    "epsLampBottom": 0.9,               # Emissivity of bottom side of lamp [-] [4]
+    "capLamp": 100,                     # Heat capacity of lamp [J K^{-1} m^{-2}] [4]
+    "cHecLampAir": 0.09,                # Heat exchange coefficient of lamp [W m^{-2} K^{-1}] [4]
+    "etaLampCool": 0,                   # Fraction of lamp input removed by cooling [-] (No cooling)
+    "zetaLampPar": 4.9,                 # J to umol conversion of PAR output of lamp [umol{PAR} J^{-1}] [2]
+    "lampsOn": 0,                       # Time of day when lamps go on [hour]
+    "lampsOff": 18,                     # Time of day when lamps go off [hour]
+})
+
+# Default parameters of LED lamps
+_LED_PARAMS = MappingProxyType({
+    "thetaLampMax": 200 / 3,            # Maximum intensity of lamps [W m^{-2}], Set to achieve a PPFD of 200 umol (PAR) m^{-2} s^{-1}
+    "heatCorrection": 0,                # Correction for temperature setpoint when lamps are on [°C]
+    "etaLampPar": 3 / 5.41,             # Fraction of lamp input converted to PAR [-], Set to give a PPE of 3 umol (PAR) J^{-1} [5]
+    "etaLampNir": 0.02,                 # Fraction of lamp input converted to NIR [-] [2]
+    "tauLampPar": 0.98,                 # Transmissivity of lamp layer to PAR [-] [3]
+    "rhoLampPar": 0,                    # Reflectivity of lamp layer to PAR [-] [3, pg. 26]
+    "tauLampNir": 0.98,                 # Transmissivity of lamp layer to NIR [-] [3]
+    "rhoLampNir": 0,                    # Reflectivity of lamp layer to NIR [-]
+    "tauLampFir": 0.98,                 # Transmissivity of lamp layer to FIR [-]
+    "aLamp": 0.02,                      # Lamp area [m^{2}{lamp} m^{-2}{floor}] [3, pg. 35]
+    "epsLampTop": 0.88,                 # Emissivity of top side of lamp [-] [4]
+    "epsLampBottom": 0.88,              # Emissivity of bottom side of lamp [-] [4]
+    "capLamp": 10,                      # Heat capacity of lamp [J K^{-1} m^{-2}] [4]
+    "cHecLampAir": 2.3,                 # Heat exchange coefficient of lamp [W m^{-2} K^{-1}] [4]
+    "etaLampCool": 0,                   # Fraction of lamp input removed by cooling [-]
+    "zetaLampPar": 5.41,                # J to umol conversion of PAR output of lamp [umol{PAR} J^{-1}], assuming 6% blue (450 nm) and 94% red (660 nm) [5]
+    "lampsOn": 0,                       # Time of day when lamps go on [hour]
+    "lampsOff": 18,                     # Time of day when lamps go off [hour]
+})
+
+# Default parameters by lamp type
+_LAMP_PRESETS = {"hps": _HPS_PARAMS, "led": _LED_PARAMS}
+
+
 def set_default_lamp_params(gl, lamp_type):
     """
     Set default settings for the lamp type in the GreenLight model.
@@ -43,43 +93,8 @@ def set_default_lamp_params(gl, lamp_type):
         Horticulture Research, 7(56). https://doi.org/10.1038/s41438-020-0283-7
     """
 
-    if lamp_type.lower() == "hps":
-        gl["p"]["thetaLampMax"] = 200 / 1.8    # Maximum intensity of lamps [W m^{-2}], Set to achieve a PPFD of 200 umol (PAR) m^{-2} s^{-1}
-        gl["p"]["heatCorrection"] = 0          # Correction for temperature setpoint when lamps are on [°C]
-        gl["p"]["etaLampPar"] = 1.8 / 4.9      # Fraction of lamp input converted to PAR [-], Set to give a PPE of 1.8 umol (PAR) J^{-1} [1, including comments online]
-        gl["p"]["etaLampNir"] = 0.22           # Fraction of lamp input converted to NIR [-] [2]
-        gl["p"]["tauLampPar"] = 0.98           # Transmissivity of lamp layer to PAR [-] [3]
-        gl["p"]["rhoLampPar"] = 0              # Reflectivity of lamp layer to PAR [-] [3, pg. 26]
-        gl["p"]["tauLampNir"] = 0.98           # Transmissivity of lamp layer to NIR [-] [3]
-        gl["p"]["rhoLampNir"] = 0              # Reflectivity of lamp layer to NIR [-]
-        gl["p"]["tauLampFir"] = 0.98           # Transmissivity of lamp layer to FIR [-]
-        gl["p"]["aLamp"] = 0.02                # Lamp area [m^{2}{lamp} m^{-2}{floor}] [3, pg. 35]
-        gl["p"]["epsLampTop"] = 0.1            # Emissivity of top side of lamp [-] [4]
-        gl["p"]["epsLampBottom"] = 0.9         # Emissivity of bottom side of lamp [-] [4]
-        gl["p"]["capLamp"] = 100               # Heat capacity of lamp [J K^{-1} m^{-2}] [4]
-        gl["p"]["cHecLampAir"] = 0.09          # Heat exchange coefficient of lamp [W m^{-2} K^{-1}] [4]
-        gl["p"]["etaLampCool"] = 0             # Fraction of lamp input removed by cooling [-] (No cooling)
-        gl["p"]["zetaLampPar"] = 4.9           # J to umol conversion of PAR output of lamp [umol{PAR} J^{-1}] [2]
-        gl["p"]["lampsOn"] = 0                 # Time of day when lamps go on [hour]
-        gl["p"]["lampsOff"] = 18               # Time of day when lamps go off [hour]
-    elif lamp_type.lower() == "led":
-        gl["p"]["thetaLampMax"] = 200 / 3      # Maximum intensity of lamps [W m^{-2}], Set to achieve a PPFD of 200 umol (PAR) m^{-2} s^{-1}
-        gl["p"]["heatCorrection"] = 0          # Correction for temperature setpoint when lamps are on [°C]
-        gl["p"]["etaLampPar"] = 3 / 5.41       # Fraction of lamp input converted to PAR [-], Set to give a PPE of 3 umol (PAR) J^{-1} [5]
-        gl["p"]["etaLampNir"] = 0.02           # Fraction of lamp input converted to NIR [-] [2]
-        gl["p"]["tauLampPar"] = 0.98           # Transmissivity of lamp layer to PAR [-] [3]
-        gl["p"]["rhoLampPar"] = 0              # Reflectivity of lamp layer to PAR [-] [3, pg. 26]
-        gl["p"]["tauLampNir"] = 0.98           # Transmissivity of lamp layer to NIR [-] [3]
-        gl["p"]["rhoLampNir"] = 0              # Reflectivity of lamp layer to NIR [-]
-        gl["p"]["tauLampFir"] = 0.98           # Transmissivity of lamp layer to FIR [-]
-        gl["p"]["aLamp"] = 0.02                # Lamp area [m^{2}{lamp} m^{-2}{floor}] [3, pg. 35]
-        gl["p"]["epsLampTop"] = 0.88           # Emissivity of top side of lamp [-] [4]
-        gl["p"]["epsLampBottom"] = 0.88        # Emissivity of bottom side of lamp [-] [4]
-        gl["p"]["capLamp"] = 10                # Heat capacity of lamp [J K^{-1} m^{-2}] [4]
-        gl["p"]["cHecLampAir"] = 2.3           # Heat exchange coefficient of lamp [W m^{-2} K^{-1}] [4]
-        gl["p"]["etaLampCool"] = 0             # Fraction of lamp input removed by cooling [-]
-        gl["p"]["zetaLampPar"] = 5.41          # J to umol conversion of PAR output of lamp [umol{PAR} J^{-1}], assuming 6% blue (450 nm) and 94% red (660 nm) [5]
-        gl["p"]["lampsOn"] = 0                 # Time of day when lamps go on [hour]
-        gl["p"]["lampsOff"] = 18               # Time of day when lamps go off [hour]
+    preset = _LAMP_PRESETS.get(lamp_type.lower() if lamp_type else "")
+    if preset:
+        gl["p"].update(preset)
 
     return gl
\ No newline at end of file
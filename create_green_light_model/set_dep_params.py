@@ -17,7 +17,18 @@ This code is licensed under the GNU GPLv3 License. For details, see the LICENSE
 """
 
 
-import numpy as np
+import math
+
+
+def _pipe_capacity(length, phi_ext, phi_int, rho_steel, c_p_steel, rho_water, c_p_water):
+    """Heat capacity of a pipe rail system filled with water [J K^{-1} m^{-2}] (Equation 21 [1])"""
+    phi_ext_sq = phi_ext * phi_ext
+    phi_int_sq = phi_int * phi_int
+    return 0.25 * math.pi * length * (
+        (phi_ext_sq - phi_int_sq) * rho_steel * c_p_steel +
+        phi_int_sq * rho_water * c_p_water
+    )
+
 
 class DependentParameters:
     def __init__(self, gl):
@@ -25,58 +36,67 @@ class DependentParameters:
 
     def set_heating_pipe_capacity(self):
         """Set heat capacity of heating pipes [J K^{-1} m^{-2}] (Equation 21 [1])"""
-        self.gl["p"]["capPipe"] = 0.25 * np.pi * self.gl["p"]["lPipe"] * (
-            (self.gl["p"]["phiPipeE"]**2 - self.gl["p"]["phiPipeI"]**2) * self.gl["p"]["rhoSteel"] * self.gl["p"]["cPSteel"] +
-            self.gl["p"]["phiPipeI"]**2 * self.gl["p"]["rhoWater"] * self.gl["p"]["cPWater"]
+        p = self.gl["p"]
+        p["capPipe"] = _pipe_capacity(
+            p["lPipe"], p["phiPipeE"], p["phiPipeI"], p["rhoSteel"], p["cPSteel"], p["rhoWater"], p["cPWater"]
         )
 
     def set_air_density(self):
         """Set density of the air [kg m^{-3}] (Equation 23 [1])"""
-        self.gl["p"]["rhoAir"] = self.gl["p"]["rhoAir0"] * np.exp(self.gl["p"]["g"] * self.gl["p"]["mAir"] * self.gl["p"]["hElevation"] / (293.15 * self.gl["p"]["R"]))
+        p = self.gl["p"]
+        p["rhoAir"] = p["rhoAir0"] * math.exp(p["g"] * p["mAir"] * p["hElevation"] / (293.15 * p["R"]))
 
     def set_heat_capacities(self):
         """Set heat capacity of greenhouse objects [J K^{-1} m^{-2}] (Equation 22 [1])"""
-        self.gl["p"]["capAir"] = self.gl["p"]["hAir"] * self.gl["p"]["rhoAir"] * self.gl["p"]["cPAir"]  # air in main compartment
-        self.gl["p"]["capFlr"] = self.gl["p"]["hFlr"] * self.gl["p"]["rhoFlr"] * self.gl["p"]["cPFlr"]  # floor
-        self.gl["p"]["capSo1"] = self.gl["p"]["hSo1"] * self.gl["p"]["rhoCpSo"]  # soil layer 1
-        self.gl["p"]["capSo2"] = self.gl["p"]["hSo2"] * self.gl["p"]["rhoCpSo"]  # soil layer 2
-        self.gl["p"]["capSo3"] = self.gl["p"]["hSo3"] * self.gl["p"]["rhoCpSo"]  # soil layer 3
-        self.gl["p"]["capSo4"] = self.gl["p"]["hSo4"] * self.gl["p"]["rhoCpSo"]  # soil layer 4
-        self.gl["p"]["capSo5"] = self.gl["p"]["hSo5"] * self.gl["p"]["rhoCpSo"]  # soil layer 5
-        self.gl["p"]["capThScr"] = self.gl["p"]["hThScr"] * self.gl["p"]["rhoThScr"] * self.gl["p"]["cPThScr"]  # thermal screen
-        self.gl["p"]["capTop"] = (self.gl["p"]["hGh"] - self.gl["p"]["hAir"]) * self.gl["p"]["rhoAir"] * self.gl["p"]["cPAir"]  # air in top compartments
-        self.gl["p"]["capBlScr"] = self.gl["p"]["hBlScr"] * self.gl["p"]["rhoBlScr"] * self.gl["p"]["cPBlScr"]  # blackout screen
+        p = self.gl["p"]
+        p["capAir"] = p["hAir"] * p["rhoAir"] * p["cPAir"]  # air in main compartment
+        p["capFlr"] = p["hFlr"] * p["rhoFlr"] * p["cPFlr"]  # floor
+        rhoCpSo = p["rhoCpSo"]
+        p["capSo1"] = p["hSo1"] * rhoCpSo  # soil layer 1
+        p["capSo2"] = p["hSo2"] * rhoCpSo  # soil layer 2
+        p["capSo3"] = p["hSo3"] * rhoCpSo  # soil layer 3
+        p["capSo4"] = p["hSo4"] * rhoCpSo  # soil layer 4
+        p["capSo5"] = p["hSo5"] * rhoCpSo  # soil layer 5
+        p["capThScr"] = p["hThScr"] * p["rhoThScr"] * p["cPThScr"]  # thermal screen
+        p["capTop"] = (p["hGh"] - p["hAir"]) * p["rhoAir"] * p["cPAir"]  # air in top compartments
+        p["capBlScr"] = p["hBlScr"] * p["rhoBlScr"] * p["cPBlScr"]  # blackout screen
 
     def set_co2_capacities(self):
         """Set capacity for CO2 [m]"""
-        self.gl["p"]["capCo2Air"] = self.gl["p"]["hAir"]
-        self.gl["p"]["capCo2Top"] = self.gl["p"]["hGh"] - self.gl["p"]["hAir"]
+        p = self.gl["p"]
+        p["capCo2Air"] = p["hAir"]
+        p["capCo2Top"] = p["hGh"] - p["hAir"]
 
     def set_pipe_surface_area(self):
         """Set surface of pipes for floor area [-] (Table 3 [1])"""
-        self.gl["p"]["aPipe"] = np.pi * self.gl["p"]["lPipe"] * self.gl["p"]["phiPipeE"]
+        p = self.gl["p"]
+        p["aPipe"] = math.pi * p["lPipe"] * p["phiPipeE"]
 
     def set_canopy_floor_view_factor(self):
         """Set view factor from canopy to floor (Table 3 [1])"""
-        self.gl["p"]["fCanFlr"] = 1 - 0.49 * np.pi * self.gl["p"]["lPipe"] * self.gl["p"]["phiPipeE"]
+        p = self.gl["p"]
+        p["fCanFlr"] = 1 - 0.49 * math.pi * p["lPipe"] * p["phiPipeE"]
 
     def set_air_pressure(self):
         """Set absolute air pressure at given elevation [Pa]"""
-        self.gl["p"]["pressure"] = 101325 * (1 - 2.5577e-5 * self.gl["p"]["hElevation"])**5.25588
+        p = self.gl["p"]
+        p["pressure"] = 101325 * (1 - 2.5577e-5 * p["hElevation"])**5.25588
         
     def set_maximum_leaf_size(self):
         """Set maximum leaf size [mg{leaf} m^{-2}]"""
-        self.gl["p"]["cLeafMax"] = self.gl["p"]["laiMax"] / self.gl["p"]["sla"]
+        p = self.gl["p"]
+        p["cLeafMax"] = p["laiMax"] / p["sla"]
 
     def set_grow_pipe_surface_area(self):
         """Set surface area of grow pipes for floor area [m^{2}{pipe} m^{-2}{floor}]"""
-        self.gl["p"]["aGroPipe"] = np.pi * self.gl["p"]["lGroPipe"] * self.gl["p"]["phiGroPipeE"]
+        p = self.gl["p"]
+        p["aGroPipe"] = math.pi * p["lGroPipe"] * p["phiGroPipeE"]
 
     def set_grow_pipe_capacity(self):
         """Set heat capacity of grow pipes [J K^{-1} m^{-2}] (Equation 21 [1])"""
-        self.gl["p"]["capGroPipe"] = 0.25 * np.pi * self.gl["p"]["lGroPipe"] * (
-            (self.gl["p"]["phiGroPipeE"]**2 - self.gl["p"]["phiGroPipeI"]**2) * self.gl["p"]["rhoSteel"] * self.gl["p"]["cPSteel"] +
-            self.gl["p"]["phiGroPipeI"]**2 * self.gl["p"]["rhoWater"] * self.gl["p"]["cPWater"]
+        p = self.gl["p"]
+        p["capGroPipe"] = _pipe_capacity(
+            p["lGroPipe"], p["phiGroPipeE"], p["phiGroPipeI"], p["rhoSteel"], p["cPSteel"], p["rhoWater"], p["cPWater"]
         )
 
     def set_dep_params(self):
@@ -1,4 +1,3 @@
-import copy
 import numpy as np
 from ..service_functions.funcs import *
 from ..service_functions.co2_dens2ppm import co2_dens2ppm
@@ -2347,4 +2346,16 @@ class GreenLightAuxiliaryStates:
 
 def set_gl_aux(gl):
     gl_aux = GreenLightAuxiliaryStates(gl)
-    return gl_aux.set_gl_aux()
\ No newline at end of file
+    return gl_aux.set_gl_aux()
+
+
+def set_gl_aux_control_rules(gl):
+    """
+    Set only the auxiliary states of the control rules, which are the ones read by set_gl_control.
+
+    The control rules depend on the states, inputs and parameters only, so calling this
+    before set_gl_control gives the same controls as a full set_gl_aux call.
+    """
+    gl_aux = GreenLightAuxiliaryStates(gl)
+    gl_aux.set_control_rules()
+    return gl
\ No newline at end of file
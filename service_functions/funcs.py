@@ -59,6 +59,25 @@ def trapz_arrays(val_array, x):
     return result
 
 
+def _find_group(gl, key):
+    """
+    Find the top-level key of gl whose dictionary contains the given second-level key.
+    Later groups take precedence if a key appears in several of them.
+
+    Args:
+        gl: A GreenLight model instance.
+        key: A second-level key, e.g. "qLampIn".
+
+    Returns:
+        The top-level key, e.g. "a".
+    """
+    for group in reversed(list(gl)):
+        value = gl[group]
+        if group != "t" and isinstance(value, dict) and key in value:
+            return group
+    raise KeyError(key)
+
+
 def calculate_energy_consumption(gl, *array_keys):
     """
     Calculate the energy consumption for the relevant parameters.
@@ -70,28 +89,19 @@ def calculate_energy_consumption(gl, *array_keys):
     Returns:
         The energy consumption in MJ.
     """
-    # Create a dictionary mapping second-level keys to top-level keys in gl
-    param_dicts = {
-        key2: key
-        for key, value in gl.items()
-        if (isinstance(value, dict) and key != "t")
-        for key2, value2 in value.items()
-    }
-
     # Initialize combined_array with None
     combined_array = None
 
     # Iterate through the keys and add the corresponding arrays to the combined_array
     for i, key in enumerate(array_keys):
-        attrib = param_dicts[key]
-        array_n = np.array(gl[attrib][key])
+        array_n = np.asarray(gl[_find_group(gl, key)][key])
         if i == 0:
-            # For the first array, extract the time sequence and initialize combined_array with zeros
+            # For the first array, extract the time sequence and initialize combined_array with a copy
             time_sequence = array_n[:, 0]
-            combined_array = np.zeros_like(array_n)
-
-        # Add the current array to the combined_array
-        combined_array += array_n
+            combined_array = np.array(array_n, dtype=float)
+        else:
+            # Add the current array to the combined_array
+            combined_array += array_n
 
     # Calculate energy consumption using the trapezoidal rule, and convert the result to MJ
     energy_consumption = np.trapz(combined_array[:, 1], time_sequence)
@@ -310,8 +320,8 @@ def extract_last_value_from_nested_dict(gl):
     gl_new = {}
     for key, value in gl.items():
         if isinstance(value, dict):  # 如果value是字典
-            # 判断字典中的第一个元素是否是数字
-            if isinstance(next(iter(value.values())), (int, float)):
+            # 判断字典中的第一个元素是否是数字(包括numpy标量, 例如float32)
+            if np.ndim(next(iter(value.values()))) == 0:
                 gl_new[key] = value
             else:  # 如果不是数字，我们假设它是ndarray
                 gl_new[key] = {param_key: param_value[-1][-1] for param_key, param_value in value.items()}